@@ -1,15 +1,34 @@
 import os
+import sys
 import cv2
 import time
 import psutil
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import pandas as pd
 import numpy as np
+import queue
+import threading
 import multiprocessing as mp
+from multiprocessing import shared_memory, resource_tracker
+import tensorflow as tf
 from collections import Counter
+from openpyxl import Workbook
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow is optional; fast_to_csv falls back to DataFrame.to_csv.
+    pa = None
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; resolve_dominant_emotions falls back to NumPy.
+    njit = None
+    prange = range
 from deepface import DeepFace
+from deepface.modules import modeling, preprocessing
 import subprocess
 from . import config  # Changed to relative import
+from .onnx_backend import OnnxEmotionModel
 
 # =============================================================================
 # Environment Setup & Global Variables
@@ -17,6 +36,9 @@ from . import config  # Changed to relative import
 # Global error counter
 error_counter = Counter()
 
+# Upper bound for the number of batches sent to a worker at once.
+MAX_CHUNKSIZE = 2
+
 # Define directories relative to the current working directory using config.py settings.
 VIDEO_DIR = config.INPUT_VIDEO_DIR  # Using INPUT_VIDEO_DIR directly from config
 ANALYSIS_DIR = config.ANALYSIS_DIR
@@ -31,10 +53,10 @@ os.makedirs(LOG_DIR, exist_ok=True)
 os.makedirs(CSV_DIR, exist_ok=True)
 os.makedirs(EXCEL_DIR, exist_ok=True)
 
-# Build the DeepFace model (default is OpenFace, please adjust in the config.py file).
-# Other options are: Facenet, VGG-Face, DeepID, ArcFace, GhostFaceNet.
-# DeepFace does allow for more models but they have not been easy to implement.
-emotion_model = DeepFace.build_model(config.EMOTION_MODEL)
+# The emotions returned by the DeepFace emotion model, in the order of its output layer.
+EMOTIONS_LIST = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
+# The columns of the analysis rows returned by the workers.
+ANALYSIS_COLUMNS = EMOTIONS_LIST + ['face_confidence', 'frame_number']
 
 # Configuration of logging
 logging.basicConfig(
@@ -61,7 +83,47 @@ def get_num_processes():
     return processes if processes else 4
 
 
-def analyse_video(video_path, frame_step=1):
+def gpu_available():
+    """
+    Function to determine whether the emotion model (in the main process) runs on a GPU.
+
+    Returns:
+        bool: True if config.USE_GPU is enabled and TensorFlow detects a GPU, False otherwise.
+    """
+    if not config.USE_GPU:
+        return False
+    try:
+        return len(tf.config.list_physical_devices('GPU')) > 0
+    except Exception as e:
+        logging.warning(f"Could not query GPU devices, falling back to the CPU: {e}")
+        return False
+
+
+def get_batch_size():
+    """
+    Function to determine the number of frames sent to a worker at once for face detection.
+
+    Returns:
+        int: The batch size defined in the config.py file (config.BATCH_SIZE)
+             or 16 if not defined.
+    """
+    batch_size = config.BATCH_SIZE
+    return batch_size if batch_size else 16
+
+
+def get_emotion_batch_size():
+    """
+    Function to determine the number of faces passed to the emotion model at once.
+
+    Returns:
+        int: The batch size defined in the config.py file (config.EMOTION_BATCH_SIZE)
+             or 64 if not defined.
+    """
+    batch_size = config.EMOTION_BATCH_SIZE
+    return batch_size if batch_size else 64
+
+
+def analyse_video(video_path, frame_step=1, pool=None):
     """
     Wrapper function to process a single video file.
     It extracts the 'source' identifier from the video's filename,
@@ -70,6 +132,7 @@ def analyse_video(video_path, frame_step=1):
     Args:
         video_path (str): Full path to the video file.
         frame_step (int): Analyse every n-th frame.
+        pool (Pool, optional): Worker pool to reuse; see create_worker_pool.
     Returns:
         DataFrame or None: The analysis DataFrame (with an added 'source' column) or None on failure.
     """
@@ -79,76 +142,361 @@ def analyse_video(video_path, frame_step=1):
     output_csv = os.path.join(CSV_DIR, f"{source}_emotional_analysis.csv")
     excel_file = os.path.join(EXCEL_DIR, f"{source}_emotional_analysis.xlsx")
     # Optionally, you might also want to create a per-video log file here if desired.
-    return analyse_video_internal(video_path, output_csv, excel_file, source, frame_step)
+    return analyse_video_internal(video_path, output_csv, excel_file, source, frame_step, pool)
 
 
-def get_dominant_emotion(emo):
+def create_worker_pool():
     """
-    Return the dominant emotion if its confidence is above the threshold defined 
-    in config.EMOTION_SCORE_THRESHOLD, else a message indicating no dominant
-    emotion has been detected.
-    
+    Create the worker pool that detects the faces. The emotion model runs in the
+    main process (on the GPU if gpu_available()), so the pool is used either way.
+
+    Returns:
+        Pool: A pool of get_num_processes() initialised workers.
+    """
+    return mp.Pool(processes=get_num_processes(), initializer=init_worker, initargs=(start_log_listener(),))
+
+
+def close_worker_pool(pool, completed):
+    """
+    Shut down a pool created by create_worker_pool and stop the log listener.
+
+    Args:
+        pool (Pool): The worker pool.
+        completed (bool): True if all results were consumed. The workers then exit on
+            their own and flush their log records; otherwise they are terminated.
+    """
+    if completed:
+        pool.close()
+    else:
+        pool.terminate()
+    pool.join()
+    stop_log_listener()
+
+
+def fast_to_csv(df, csv_path):
+    """
+    Save a DataFrame as a CSV file with pyarrow's multi-threaded CSV writer,
+    or with DataFrame.to_csv if pyarrow is not installed.
+
+    Args:
+        df (DataFrame): The data to save (saved without its index).
+        csv_path (str): Path of the CSV file to write.
+    """
+    if pa is None:
+        df.to_csv(csv_path, index=False)
+        return
+    # Arrow cannot store Python objects such as the region and raw_output dicts,
+    # so object columns are written as text, as DataFrame.to_csv does.
+    table_df = df.copy(deep=False)
+    for column in table_df.columns[table_df.dtypes == object]:
+        table_df[column] = table_df[column].astype(str)
+    pa_csv.write_csv(pa.Table.from_pandas(table_df, preserve_index=False), csv_path)
+
+
+def fast_to_excel(df, excel_path):
+    """
+    Save a DataFrame as an Excel file using a write-only openpyxl workbook.
+    Rows are streamed to the file instead of building a styled cell object
+    for every value as DataFrame.to_excel does.
+
+    Args:
+        df (DataFrame): The data to save (saved without its index).
+        excel_path (str): Path of the Excel file to write.
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title="Sheet1")
+    worksheet.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        worksheet.append([to_excel_value(value) for value in row])
+    workbook.save(excel_path)
+
+
+def to_excel_value(value):
+    """
+    Convert a DataFrame value into a value openpyxl can write to a cell.
+
+    Args:
+        value: The value to convert.
+    Returns:
+        The value itself for numbers and strings, None for missing values
+        and the string representation for anything else (e.g. dicts).
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return None if value != value else value  # NaN becomes an empty cell.
+    if value is None:
+        return None
+    return str(value)
+
+
+def _resolve_dominant_emotions_kernel(scores, face_confidence, face_threshold, emotion_threshold):
+    # One pass over the (N, 7) score matrix; compiled with Numba when it is installed.
+    codes = np.empty(scores.shape[0], dtype=np.int8)
+    for i in prange(scores.shape[0]):
+        if face_confidence[i] < face_threshold:
+            codes[i] = -1
+        else:
+            best = 0
+            best_score = scores[i, 0]
+            for j in range(1, scores.shape[1]):
+                if scores[i, j] > best_score:
+                    best = j
+                    best_score = scores[i, j]
+            codes[i] = best if best_score >= emotion_threshold else -2
+    return codes
+
+
+def _resolve_dominant_emotions_numpy(scores, face_confidence, face_threshold, emotion_threshold):
+    # Same result as the kernel above, for installations without Numba.
+    codes = scores.argmax(axis=1).astype(np.int8)
+    codes[scores.max(axis=1) < emotion_threshold] = -2
+    codes[face_confidence < face_threshold] = -1
+    return codes
+
+
+if njit is not None:
+    _resolve_dominant_emotions = njit(parallel=True, cache=True)(_resolve_dominant_emotions_kernel)
+else:
+    _resolve_dominant_emotions = _resolve_dominant_emotions_numpy
+
+# Labels of the codes returned by resolve_dominant_emotions; -1 and -2 index from the end.
+DOMINANT_EMOTION_LABELS = np.array(EMOTIONS_LIST + ['no dominant emotion detected', 'no face detected'], dtype=object)
+
+
+def resolve_dominant_emotions(scores, face_confidence, face_threshold, emotion_threshold):
+    """
+    Determine the dominant emotion of every analysed frame at once: the emotion
+    with the highest score if a face was detected and that score reaches the
+    threshold (ties resolve to the first emotion in EMOTIONS_LIST).
+
     Args:
-        emo (dict): The emotions determined by DeepFace.
+        scores (ndarray): (N, 7) emotion scores in the order of EMOTIONS_LIST.
+        face_confidence (ndarray): (N,) face detection confidences.
+        face_threshold (float): Minimum face confidence for a face to count as detected.
+        emotion_threshold (float): Minimum score for an emotion to count as dominant.
     Returns:
-        str: The dominant emotion or a message indicating no dominant emotion detected.
+        ndarray: (N,) int8 codes, the index into EMOTIONS_LIST of the dominant emotion,
+                 -1 if no face was detected or -2 if no emotion is dominant.
+                 DOMINANT_EMOTION_LABELS[codes] gives the labels.
     """
-    if not emo:
-        return 'no emotion detected'
-    dominant = max(emo, key=emo.get)
-    dominant = max(emo, key=emo.get)
-    threshold = config.EMOTION_SCORE_THRESHOLD if config.EMOTION_SCORE_THRESHOLD is not None else 50
-    return dominant if emo[dominant] >= threshold else 'no dominant emotion detected'
+    return _resolve_dominant_emotions(
+        np.ascontiguousarray(scores, dtype=np.float64),
+        np.ascontiguousarray(face_confidence, dtype=np.float64),
+        float(face_threshold),
+        float(emotion_threshold)
+    )
 
 
+# Global variable for the Keras emotion classifier of the main process (built on first use).
+global_emotion_classifier = None
+# Global variable for the shared memory block holding the frames of the current video.
+global_shared_frames = None
+# Global variables for the queue through which the workers send their log records to the main process.
+global_log_queue = None
+global_log_listener = None
+
+
+def start_log_listener():
+    """
+    Start passing the log records that the workers put on the log queue to the
+    handlers of the main process (the log file and the console).
+
+    Returns:
+        Queue: The log queue to hand to init_worker.
+    """
+    global global_log_queue, global_log_listener
+    if global_log_listener is None:
+        global_log_queue = mp.Queue()
+        global_log_listener = QueueListener(global_log_queue, *logging.getLogger().handlers,
+                                            respect_handler_level=True)
+        global_log_listener.start()
+    return global_log_queue
+
+
+def stop_log_listener():
+    """Write out the remaining log records of the workers and stop the log listener."""
+    global global_log_listener
+    if global_log_listener is not None:
+        global_log_listener.stop()
+        global_log_listener = None
 
-# Global variable for the preloaded model
-global_model = None
 
 # Initialiser of each worker / subprocess
-def init_worker(backend_model):
-    """Initialize each worker with a preloaded model."""
-    global global_model
-    global_model = backend_model
+def init_worker(log_queue):
+    """
+    Initialize each worker. Workers only detect faces, so no model is passed
+    to them; the emotion model is owned by the main process.
+
+    The log records of the worker are put on log_queue instead of being written
+    to the log file and the console by the worker itself.
+    """
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(logging.INFO)
+
+
+def get_emotion_classifier():
+    """
+    Return the Keras emotion CNN that DeepFace.analyze uses internally.
+    The model is built once in the main process and cached, so that batches
+    of faces can be passed to it directly.
 
+    If config.EMOTION_INFERENCE_BACKEND is "onnx-int8", an INT8 ONNX Runtime
+    version of the model is returned instead (see onnx_backend.py).
 
-def analyse_emotion_multiproc(args):
+    Returns:
+        keras.Model or OnnxEmotionModel: The DeepFace emotion model (input shape 48x48x1, 7 outputs).
+    """
+    global global_emotion_classifier
+    if global_emotion_classifier is None:
+        if not config.USE_GPU:
+            # Keep TensorFlow on the CPU even if it detects a GPU.
+            try:
+                tf.config.set_visible_devices([], 'GPU')
+            except (RuntimeError, ValueError) as e:
+                logging.warning(f"Could not hide the GPU from TensorFlow: {e}")
+        keras_model = modeling.build_model(task="facial_attribute", model_name="Emotion").model
+        classifier = keras_model
+        if config.EMOTION_INFERENCE_BACKEND == "onnx-int8":
+            try:
+                classifier = OnnxEmotionModel(keras_model, config.ONNX_MODEL_DIR)
+                logging.info("Running the emotion model with ONNX Runtime (INT8).")
+            except Exception as e:
+                # Missing packages or a failed export/quantisation fall back to Keras.
+                logging.warning(f"ONNX Runtime backend unavailable ({e}); using the Keras emotion model.")
+        global_emotion_classifier = classifier
+    return global_emotion_classifier
+
+
+def attach_shared_frames(shm_name):
     """
-    Analyse a single frame using the preloaded DeepFace model.
+    Attach the worker to the shared memory block holding the frames of a video.
+    The block stays attached until a block with another name is requested.
+
     Args:
-        args (tuple): Contains (frame, frame_number, backend).
+        shm_name (str): Name of the shared memory block created by analyse_video_internal.
     Returns:
-        tuple: (analysis_dict, candidate_dominant_emotion, error message)
+        SharedMemory: The attached shared memory block.
     """
-    frame, frame_number, backend = args
-    # Check for an empty frame.
-    if frame is None or frame.size == 0 or frame.shape[0] == 0 or frame.shape[1] == 0:
-        return None, None, f'Invalid frame at frame number {frame_number}.'
-    try:
-        # Perform DeepFace analysis using the preloaded model.
-        analysis = DeepFace.analyze(
-            img_path=frame,
-            actions=['emotion'],
-            enforce_detection=False,
-            detector_backend=backend
-        )
-        emotions = analysis[0].get('emotion', {})
-        # Determine the candidate dominant emotion.
-        candidate = max(emotions, key=emotions.get)
-        # Attach frame_number and face_confidence for downstream use.
-        analysis[0]['frame_number'] = frame_number
-        # Return the analysis result and candidate; let get_dominant_emotion decide final output.
-        return analysis[0], candidate, None
-    except Exception as e:
-        logging.error(f'Error analysing frame {frame_number} with backend {backend}: {e}')
-        error_counter['first_backend_error'] += 1
-        return None, None, f'Error in analysis in frame {frame_number} with {backend}'
+    global global_shared_frames
+    if global_shared_frames is None or global_shared_frames.name != shm_name:
+        detach_shared_frames()
+        # Only the main process, which created the block, may track and unlink it.
+        if sys.version_info >= (3, 13):
+            global_shared_frames = shared_memory.SharedMemory(name=shm_name, track=False)
+        else:
+            global_shared_frames = shared_memory.SharedMemory(name=shm_name)
+            if mp.get_start_method() == "fork":
+                # Forked workers start their own resource tracker, which would report the
+                # block as leaked when they exit. Spawned workers share the main tracker.
+                resource_tracker.unregister(global_shared_frames._name, "shared_memory")
+    return global_shared_frames
+
+
+def detach_shared_frames():
+    """Detach the current process from the shared memory block of the last video, if any."""
+    global global_shared_frames
+    if global_shared_frames is not None:
+        try:
+            global_shared_frames.close()
+        except BufferError:
+            # A frame view is still referenced (e.g. by a traceback); it is freed with the process.
+            pass
+        global_shared_frames = None
+
+
+def preprocess_face(face):
+    """
+    Convert a face extracted by DeepFace into the 48x48 grayscale input of the
+    emotion model, using the same steps as DeepFace.analyze.
+
+    Args:
+        face (ndarray): RGB face crop as returned by DeepFace.extract_faces.
+    Returns:
+        ndarray: The 48x48 grayscale face.
+    """
+    face = face[:, :, ::-1]  # rgb to bgr
+    face = preprocessing.resize_image(img=face, target_size=(224, 224))
+    face_gray = cv2.cvtColor(face[0], cv2.COLOR_BGR2GRAY)
+    return cv2.resize(face_gray, (48, 48))
+
+
+def detect_faces_multiproc(args):
+    """
+    Detect and preprocess the faces of a batch of frames (first stage of the analysis).
+    The frames are read without copying from a slot of the shared memory block
+    of the video. The emotion model itself runs in the main process on the faces
+    of many batches at once, see predict_emotions.
+    Args:
+        args (tuple): Contains (shm_name, slot, frame_shape, frame_numbers, backend).
+    Returns:
+        tuple: (slot, faces, face_info, regions, errors) where faces holds the 48x48
+               grayscale face of each detected frame, face_info its (face_confidence,
+               frame_number), regions its face region and errors the messages of failed frames.
+    """
+    shm_name, slot, frame_shape, frame_numbers, backend = args
+    errors = []
+    shm = attach_shared_frames(shm_name)
+    slot_offset = slot * get_batch_size() * int(np.prod(frame_shape))
+    frames = np.ndarray((len(frame_numbers),) + tuple(frame_shape), dtype=np.uint8,
+                        buffer=shm.buf, offset=slot_offset)
+    faces = []
+    face_info = []
+    regions = []
+    for frame, frame_number in zip(frames, frame_numbers):
+        # Check for an empty frame.
+        if frame is None or frame.size == 0 or frame.shape[0] == 0 or frame.shape[1] == 0:
+            errors.append(f'Invalid frame at frame number {frame_number}.')
+            continue
+        try:
+            # Only the first face is analysed, as with DeepFace.analyze(...)[0].
+            face_obj = DeepFace.extract_faces(
+                img_path=frame,
+                detector_backend=backend,
+                enforce_detection=False
+            )[0]
+            if face_obj['face'].shape[0] == 0 or face_obj['face'].shape[1] == 0:
+                raise ValueError('Empty face region')
+            faces.append(preprocess_face(face_obj['face']))
+            face_info.append((face_obj['confidence'], frame_number))
+            regions.append(face_obj['facial_area'])
+        except Exception as e:
+            logging.error(f'Error analysing frame {frame_number} with backend {backend}: {e}')
+            error_counter['first_backend_error'] += 1
+            errors.append(f'Error in analysis in frame {frame_number} with {backend}')
+
+    faces = np.array(faces, dtype=np.float32).reshape(-1, 48, 48)
+    face_info = np.array(face_info, dtype=np.float64).reshape(-1, 2)
+    return slot, faces, face_info, regions, errors
+
+
+def predict_emotions(faces):
+    """
+    Run the emotion model on preprocessed faces (second stage of the analysis),
+    in forward passes of get_emotion_batch_size() faces.
+    Args:
+        faces (ndarray): (N, 48, 48) grayscale faces as returned by preprocess_face.
+    Returns:
+        ndarray: (N, 7) emotion scores in percent, in the order of EMOTIONS_LIST.
+    """
+    model = get_emotion_classifier()
+    batch_size = get_emotion_batch_size()
+    predictions = np.concatenate([
+        np.asarray(model.predict_on_batch(faces[start:start + batch_size, ..., np.newaxis]), dtype=np.float64)
+        for start in range(0, len(faces), batch_size)
+    ])
+    # Scale to percentages as DeepFace.analyze does.
+    return 100 * predictions / predictions.sum(axis=1, keepdims=True)
 
 
 # =============================================================================
 # Video Analysis Functions
 # =============================================================================
-def analyse_video_internal(video_path, output_csv, excel_file, source, frame_step):
+def analyse_video_internal(video_path, output_csv, excel_file, source, frame_step, pool=None):
     """
     Processes one video file: opens the video, samples frames at the specified rate,
     runs DeepFace analysis on each selected frame using multiprocessing,
@@ -160,6 +508,8 @@ def analyse_video_internal(video_path, output_csv, excel_file, source, frame_ste
         excel_file (str): Path where to save the Excel results
         source (str): Identifier for the video source (typically the filename without extension)
         frame_step (int): Analyze every n-th frame
+        pool (Pool, optional): Worker pool to reuse across videos. If None, a pool is
+            created for this video.
         
     Returns:
         DataFrame or None: The analysis results as a DataFrame, or None if processing failed
@@ -177,63 +527,192 @@ def analyse_video_internal(video_path, output_csv, excel_file, source, frame_ste
 
     frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     frame_rate = int(cap.get(cv2.CAP_PROP_FPS))
-    tasks = []
-    frame_number = 0
-    total_frames = 0
-
-    # Collect frames for analysis based on the frame step.
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        total_frames += 1
-        if frame_number % frame_step == 0:
-            tasks.append((frame, frame_number, 'opencv'))
-        frame_number += 1
-        if frame_number % 1000 == 0:
-            interim_time = time.time()
-            logging.info(f"Read frame {frame_number} of input video after {interim_time - start_time:.2f} seconds")
-    cap.release()
-
-    logging.info(f"Video {video_path} has {total_frames} frames; frame step: {frame_step}; {len(tasks)} frames to analyse.")
-
-    # Use multiprocessing with progress tracking.
+    batch_size = get_batch_size()
+    detector_backend = config.DETECTOR_BACKEND or 'opencv'
+    # The frame count reported by the container is only used to estimate progress.
+    expected_tasks = max(1, -(-frame_count // frame_step))
+    logging.info(f"Video {video_path} reports {frame_count} frames; frame step: {frame_step}; "
+                 f"analysing about {expected_tasks} frames in batches of {batch_size}.")
+
+    # Faces are detected by a pool of processes; the emotion model runs in this process.
     num_processes = get_num_processes()
-    logging.info(f"Using {num_processes} processes for processing.")
-    manager = mp.Manager()
-    progress_counter = manager.Value('i', 0)  # Shared progress counter
-    lock = manager.Lock()  # Explicit lock for synchronization
-    total_tasks = len(tasks)
-
-    def update_progress(result):
-        # Callback function to update progress.
-        nonlocal progress_counter
-        with lock:  # Use the explicit lock
-            progress_counter.value += 1
-            current_progress = progress_counter.value
-            if current_progress % max(1, total_tasks // 10) == 0:  # Log every 10%
-                elapsed_time = time.time() - start_time
-                logging.info(
-                    f"Processed {current_progress}/{total_tasks} frames ({current_progress / total_tasks * 100:.1f}%), Elapsed Time: {elapsed_time:.1f}s"
-                )
+    logging.info(f"Using {num_processes} processes for face detection.")
+
+    # The first frame determines the size of the shared memory slots.
+    ret, first_frame = cap.read()
+    if not ret:
+        logging.error(f"Error: Could not read frames from video {video_path}.")
+        cap.release()
+        return None
+    frame_shape = first_frame.shape
+
+    # Frames are read while the workers run and are written straight into a ring of
+    # shared memory slots of one batch each. Workers read them from there without a
+    # copy, and a slot is only reused once its batch has been analysed, so memory
+    # no longer grows with the video length.
+    # Each task already holds a whole batch, so a small chunksize is enough to amortise
+    # the remaining IPC. A chunk ties up chunksize slots until all of its batches are
+    # analysed, so the ring holds one chunk per process plus one spare slot per process.
+    expected_batches = -(-expected_tasks // batch_size)
+    chunksize = max(1, min(MAX_CHUNKSIZE, expected_batches // (num_processes * 4)))
+    num_slots = chunksize * num_processes + num_processes
+    shared_frames = shared_memory.SharedMemory(create=True, size=num_slots * batch_size * first_frame.nbytes)
+    ring = np.ndarray((num_slots, batch_size) + frame_shape, dtype=np.uint8, buffer=shared_frames.buf)
+    free_slots = queue.Queue()
+    for slot in range(num_slots):
+        free_slots.put(slot)
+    stop_reading = threading.Event()
+    total_frames = 0
+    total_tasks = 0
+
+    def read_sampled_frames():
+        # Yield (frame_number, frame) for every frame_step-th frame. Skipped frames are
+        # only grabbed, so they are never converted to BGR images or copied.
+        nonlocal total_frames
+        total_frames = 1
+        yield 0, first_frame
+        frame_number = 0
+        next_log = 1000
+        while not stop_reading.is_set():
+            # Step over the skipped frames, then read the next sampled one.
+            for skipped in range(frame_step - 1):
+                if not cap.grab():
+                    total_frames += skipped
+                    return
+            total_frames += frame_step - 1
+            ret, frame = cap.read()
+            if not ret:
+                return
+            total_frames += 1
+            frame_number += frame_step
+            yield frame_number, frame
+            if total_frames >= next_log:
+                interim_time = time.time()
+                logging.info(f"Read frame {total_frames} of input video after {interim_time - start_time:.2f} seconds")
+                next_log = (total_frames // 1000 + 1) * 1000
+
+    def generate_batches():
+        # Collect the sampled frames for analysis, grouped into batches.
+        nonlocal total_tasks
+        slot = None
+        batch_frame_numbers = []
+        try:
+            for frame_number, frame in read_sampled_frames():
+                if stop_reading.is_set():
+                    return
+                if not batch_frame_numbers:
+                    slot = free_slots.get()
+                    if stop_reading.is_set():
+                        return
+                if frame.shape != frame_shape:
+                    frame = cv2.resize(frame, (frame_shape[1], frame_shape[0]))
+                ring[slot, len(batch_frame_numbers)] = frame
+                batch_frame_numbers.append(frame_number)
+                total_tasks += 1
+                if len(batch_frame_numbers) == batch_size:
+                    yield (shared_frames.name, slot, frame_shape, batch_frame_numbers, detector_backend)
+                    batch_frame_numbers = []
+            if batch_frame_numbers:
+                yield (shared_frames.name, slot, frame_shape, batch_frame_numbers, detector_backend)
+        finally:
+            cap.release()
 
     # Start timing the analysis phase
     analysis_start_time = time.time()
-    results = []
+    progress_step = max(1, expected_tasks // 10)
+    processed_frames = 0
+    # Rows of the analysed faces are written straight into preallocated buffers,
+    # sized from the frame count reported by the container (grown if it was too low).
+    analysis = np.empty((expected_tasks, len(ANALYSIS_COLUMNS)), dtype=np.float64)
+    regions = np.empty(expected_tasks, dtype=object)
     analysed_frames = 0
     unsuccessful_retries = 0
 
-    with mp.Pool(processes=num_processes, initializer=init_worker, initargs=(emotion_model,)) as pool:
-        for res in pool.imap_unordered(analyse_emotion_multiproc, tasks):
-            update_progress(res)  # Update progress
-            analysis_dict, emotion, error = res
-            if analysis_dict:
-                results.append(analysis_dict)
-                analysed_frames += 1
-            elif error:
+    # Faces detected by the workers wait here until there are enough for a full
+    # forward pass of the emotion model.
+    emotion_batch_size = get_emotion_batch_size()
+    pending_faces = []
+    pending_info = []
+    pending_regions = []
+    pending_count = 0
+
+    def analyse_pending_faces():
+        # Second stage: run the emotion model on all pending faces.
+        nonlocal pending_faces, pending_info, pending_regions, pending_count, analysed_frames, unsuccessful_retries
+        nonlocal analysis, regions
+        if not pending_count:
+            return
+        face_info = np.concatenate(pending_info)
+        try:
+            scores = predict_emotions(np.concatenate(pending_faces))
+        except Exception as e:
+            logging.error(f'Error predicting emotions for {pending_count} faces: {e}')
+            error_counter['first_backend_error'] += pending_count
+            for frame_number in face_info[:, 1].astype(np.int64):
+                logging.warning(f'Error in analysis in frame {frame_number} with {detector_backend}')
+            unsuccessful_retries += pending_count
+        else:
+            start, end = analysed_frames, analysed_frames + pending_count
+            if end > len(analysis):
+                size = max(end, 2 * len(analysis))
+                grown_analysis = np.empty((size, len(ANALYSIS_COLUMNS)), dtype=np.float64)
+                grown_analysis[:start] = analysis[:start]
+                grown_regions = np.empty(size, dtype=object)
+                grown_regions[:start] = regions[:start]
+                analysis, regions = grown_analysis, grown_regions
+            analysis[start:end, :len(EMOTIONS_LIST)] = scores
+            analysis[start:end, ANALYSIS_COLUMNS.index('face_confidence')] = face_info[:, 0]
+            analysis[start:end, ANALYSIS_COLUMNS.index('frame_number')] = face_info[:, 1]
+            regions[start:end] = pending_regions
+            analysed_frames = end
+        pending_faces, pending_info, pending_regions, pending_count = [], [], [], 0
+
+    own_pool = pool is None
+    if own_pool:
+        pool = create_worker_pool()
+    # Only probe the GPU once the workers are forked, so CUDA is not initialised before the fork.
+    if gpu_available():
+        logging.info("GPU detected; running the emotion model on the GPU.")
+    batch_results_iter = pool.imap_unordered(detect_faces_multiproc, generate_batches(), chunksize=chunksize)
+
+    completed = False
+    try:
+        for slot, faces, face_info, batch_regions, errors in batch_results_iter:
+            free_slots.put(slot)  # Let the reader fill the slot with the next batch.
+
+            if len(faces):
+                pending_faces.append(faces)
+                pending_info.append(face_info)
+                pending_regions.extend(batch_regions)
+                pending_count += len(faces)
+                if pending_count >= emotion_batch_size:
+                    analyse_pending_faces()
+            for error in errors:
                 logging.warning(error)
                 unsuccessful_retries += 1
 
+            # Results arrive in this process, so progress is counted here directly.
+            previous_frames = processed_frames
+            processed_frames += len(faces) + len(errors)
+            if processed_frames // progress_step > previous_frames // progress_step:  # Log every 10%
+                elapsed_time = time.time() - start_time
+                logging.info(
+                    f"Processed {processed_frames}/{expected_tasks} frames ({processed_frames / expected_tasks * 100:.1f}%), Elapsed Time: {elapsed_time:.1f}s"
+                )
+        analyse_pending_faces()
+        completed = True
+    finally:
+        # Unblock the reader in case the analysis stopped early.
+        stop_reading.set()
+        free_slots.put(None)
+        if own_pool:
+            close_worker_pool(pool, completed)
+        del ring
+        shared_frames.close()
+        shared_frames.unlink()
+
+    logging.info(f"Video {video_path} has {total_frames} frames; frame step: {frame_step}; {total_tasks} frames analysed in batches of {batch_size}.")
+
     # Record the end time for the analysis phase
     analysis_end_time = time.time()
     analysis_duration = analysis_end_time - analysis_start_time
@@ -243,31 +722,39 @@ def analyse_video_internal(video_path, output_csv, excel_file, source, frame_ste
     duration = end_time - start_time
     logging.info(f"Finished processing video {video_path} at {time.ctime(end_time)}; Duration: {duration:.2f} seconds")
     logging.info("Analysis phase took %.2f seconds with the model %s",
-                 analysis_duration, emotion_model.__class__.__name__)  # Log the model used
+                 analysis_duration, config.EMOTION_MODEL)  # Log the model used
 
     # Build DataFrame and save results.
-    if results:
-        df = pd.DataFrame(results)
-        if 'emotion' in df.columns:
-            df.rename(columns={'emotion': 'raw_output'}, inplace=True)
+    if analysed_frames:
+        # Build the DataFrame in one go from the filled part of the buffers.
+        analysis = analysis[:analysed_frames]
+        regions = regions[:analysed_frames]
+        raw_scores = analysis[:, :len(EMOTIONS_LIST)]
+        df = pd.DataFrame({
+            'frame_number': analysis[:, ANALYSIS_COLUMNS.index('frame_number')].astype(np.int64),
+            'face_confidence': analysis[:, ANALYSIS_COLUMNS.index('face_confidence')],
+            'region': regions,
+        })
 
         # Define the list of emotions.
-        emotions_list = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
+        emotions_list = EMOTIONS_LIST
 
         # For each emotion column, if face_confidence is below the threshold, set the value to 0.
-        for emo in emotions_list:
-            df[emo] = df.apply(
-                lambda row: row['raw_output'].get(emo, 0) 
-                if row['face_confidence'] >= config.FACE_CONFIDENCE_THRESHOLD else 0, 
-                axis=1
-            )
-
-        # Add the dominant emotion column.
-        df['dominant_emotion'] = df.apply(
-            lambda row: 'no face detected' 
-            if row['face_confidence'] < config.FACE_CONFIDENCE_THRESHOLD 
-            else get_dominant_emotion(row['raw_output']), axis=1
-        )
+        face_threshold = config.FACE_CONFIDENCE_THRESHOLD
+        face_detected = df['face_confidence'].to_numpy() >= face_threshold
+        scores = np.where(face_detected[:, np.newaxis], raw_scores, 0)
+        df[emotions_list] = scores
+
+        # The unmasked scores are only turned into per-row dicts if they are written to the output files.
+        if config.INCLUDE_RAW_OUTPUT:
+            df['raw_output'] = [dict(zip(emotions_list, row)) for row in raw_scores.tolist()]
+
+        # Add the dominant emotion column (see resolve_dominant_emotions).
+        threshold = config.EMOTION_SCORE_THRESHOLD
+        if threshold is None:
+            threshold = 50
+        dominant_codes = resolve_dominant_emotions(scores, df['face_confidence'].to_numpy(), face_threshold, threshold)
+        df['dominant_emotion'] = DOMINANT_EMOTION_LABELS[dominant_codes]
 
         # Base column ordering for individual files.
         columns_order = ['frame_number', 'dominant_emotion'] + emotions_list + ['face_confidence', 'region', 'raw_output']
@@ -281,16 +768,14 @@ def analyse_video_internal(video_path, output_csv, excel_file, source, frame_ste
         df.sort_values(by="frame_number", inplace=True)
 
         # Save as CSV.
-        df.to_csv(output_csv, index=False)
+        fast_to_csv(df, output_csv)
         # Also save as Excel.
-        df.to_excel(excel_file, index=False)
+        fast_to_excel(df, excel_file)
 
         # Log a summary.
         emotion_counts = {}
         if 'dominant_emotion' in df.columns:
-            unique_emotions = df['dominant_emotion'].unique()
-            for e in unique_emotions:
-                emotion_counts[e] = df['dominant_emotion'].tolist().count(e)
+            emotion_counts = df['dominant_emotion'].value_counts(sort=False).to_dict()
 
         # Calculate combined count for failures (using both messages)
         no_dominant = emotion_counts.get('no dominant emotion detected', 0)
@@ -344,13 +829,20 @@ def process_all_videos(frame_step=1):
     logging.info(message)
 
     combined_dfs = []
-    for video in video_files:
-        print(f"Processing {video}...")
-        logging.info(f"Processing {video}...")
-        # Call the wrapper function that correctly prepares the arguments
-        df = analyse_video(video, frame_step=frame_step)
-        if df is not None:
-            combined_dfs.append(df)
+    # One pool serves all videos, so workers are started and initialised only once.
+    pool = create_worker_pool()
+    completed = False
+    try:
+        for video in video_files:
+            print(f"Processing {video}...")
+            logging.info(f"Processing {video}...")
+            # Call the wrapper function that correctly prepares the arguments
+            df = analyse_video(video, frame_step=frame_step, pool=pool)
+            if df is not None:
+                combined_dfs.append(df)
+        completed = True
+    finally:
+        close_worker_pool(pool, completed)
 
     if combined_dfs:
         combined_df = pd.concat(combined_dfs, ignore_index=True)
@@ -368,8 +860,8 @@ def process_all_videos(frame_step=1):
 
         combined_csv = os.path.join(CSV_DIR, "combined_emotional_analysis.csv")
         combined_excel = os.path.join(EXCEL_DIR, "combined_emotional_analysis.xlsx")
-        combined_df.to_csv(combined_csv, index=False)
-        combined_df.to_excel(combined_excel, index=False)
+        fast_to_csv(combined_df, combined_csv)
+        fast_to_excel(combined_df, combined_excel)
 
         message = f"Combined analysis saved to:\n  CSV: {combined_csv}\n  Excel: {combined_excel}"
         print(message)
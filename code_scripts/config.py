@@ -12,6 +12,10 @@ INPUT_VIDEO_DIR = os.path.join(PROJECT_ROOT, "videos for AFEA demonstration")
 
 # Analysis and video input/output settings.
 FRAME_STEP = 1 # Analyse every n-th frame. The input through the terminal with sampling_rate can override this.
+BATCH_SIZE = 16 # Number of frames sent to a worker at once for face detection.
+EMOTION_BATCH_SIZE = 64 # Number of detected faces passed through the emotion model in one forward pass.
+DETECTOR_BACKEND = "opencv" # DeepFace face detector: opencv, retinaface, mtcnn, ssd, dlib, mediapipe, yolov8, yunet, centerface.
+INCLUDE_RAW_OUTPUT = False # Add the raw_output column (unmasked emotion scores of each frame as a dict) to the CSV/Excel files.
 REQUIREMENTS_PATH = os.path.join(_SCRIPTS_DIR, "requirements.txt")
 VIDEO_PATH = INPUT_VIDEO_DIR    # Folder with the input video files to be analysed.
 ANALYSIS_DIR = os.path.join(PROJECT_ROOT, "raw data output files")# Folder where analysis CSV/Excel files are saved.
@@ -24,6 +28,7 @@ DATA_VISUALISATION_DIR = os.path.join(PROJECT_ROOT, "data visualisation")
 PLOTS_DIR = DATA_VISUALISATION_DIR            # Folder where the plots files are saved.
 ANIMATIONS_DIR = DATA_VISUALISATION_DIR       # Folder where the animation files and segments are saved.
 LOG_DIR = os.path.join(PROJECT_ROOT, "logs")                      # Folder where the log files are saved.
+CACHE_DIR = os.path.join(PROJECT_ROOT, ".cache")                  # Folder where cached results (e.g. of the static plots) are kept.
 
 # Thresholds
 FACE_CONFIDENCE_THRESHOLD = 0.9     # Confidence threshold for face detection.
@@ -34,6 +39,14 @@ EMOTION_MODEL = "Facenet"           # Defines which facial recognition model is
                                     # after the download of new model weights. 
                                     # DeepFace does allow for more models but they have not been easy to implement.
 
+# Hardware settings
+EMOTION_INFERENCE_BACKEND = "keras"  # "keras" runs the DeepFace emotion model as is. "onnx-int8" converts it once to an
+                                    # INT8-quantized ONNX model and runs it with ONNX Runtime, which is faster on CPUs
+                                    # but gives slightly different scores. Requires: pip install tf2onnx onnxruntime
+ONNX_MODEL_DIR = os.path.join(PROJECT_ROOT, "models")  # Folder where the converted ONNX models are saved.
+USE_GPU = True                      # Run the emotion model on the GPU if TensorFlow detects one (faces are
+                                    # always detected by the CPU process pool below). Set to False to use the CPU.
+
 # Thread and Segmentation settings
 CPU_CORES = psutil.cpu_count(logical=False) # Get number of physical CPU cores.
 POOL_SIZE = (CPU_CORES) // 4                # We set the pool size to two-thirds the number of CPU cores.
@@ -44,4 +57,6 @@ NUM_SEGMENTS = POOL_SIZE * 2                # Number of segments to divide the v
 FRAME_RATE = 30     # Default frame rate (if not read from video).
 PLOT_WIDTH = 19.2   # Width of the static plot (in inches).
 PLOT_HEIGHT = 5.4   # Height of the static plot (in inches).
-PLOT_DPI = 100      # Pixels per inch (dots per inch).
\ No newline at end of file
+PLOT_DPI = 100      # Pixels per inch (dots per inch).
+BAR_BIN_SECONDS = 0.1  # Width of the bars in seconds. Each bar shows the highest score of the frames it covers.
+                       # Set to None to draw one bar (0.1 seconds wide) per frame.
@@ -0,0 +1,62 @@
+import os
+import logging
+import numpy as np
+
+
+def export_quantized_emotion_model(keras_model, model_dir):
+    """
+    Export the Keras emotion model to ONNX and quantize its weights to INT8.
+    Both files are kept in model_dir, so the conversion only runs once.
+
+    Args:
+        keras_model (keras.Model): The DeepFace emotion model (input shape 48x48x1).
+        model_dir (str): Folder where the ONNX files are saved.
+    Returns:
+        str: Path to the quantized ONNX model.
+    """
+    # tf2onnx and onnxruntime are only needed for this backend, so they are imported here.
+    import tensorflow as tf
+    import tf2onnx
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    os.makedirs(model_dir, exist_ok=True)
+    onnx_path = os.path.join(model_dir, "emotion.onnx")
+    int8_path = os.path.join(model_dir, "emotion.int8.onnx")
+    if os.path.exists(int8_path):
+        return int8_path
+
+    logging.info(f"Exporting the emotion model to {onnx_path}...")
+    input_signature = (tf.TensorSpec((None, 48, 48, 1), tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(keras_model, input_signature=input_signature, output_path=onnx_path)
+
+    logging.info(f"Quantizing the emotion model to {int8_path}...")
+    quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+class OnnxEmotionModel:
+    """
+    INT8 ONNX Runtime version of the DeepFace emotion model for CPU inference.
+    Offers the same predict_on_batch method as the Keras model it replaces.
+    """
+
+    def __init__(self, keras_model, model_dir):
+        """
+        Args:
+            keras_model (keras.Model): The DeepFace emotion model to convert.
+            model_dir (str): Folder where the ONNX files are saved.
+        """
+        import onnxruntime as ort
+
+        model_path = export_quantized_emotion_model(keras_model, model_dir)
+        self.session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict_on_batch(self, batch):
+        """
+        Args:
+            batch (ndarray): (N, 48, 48, 1) grayscale faces.
+        Returns:
+            ndarray: (N, 7) emotion probabilities.
+        """
+        return self.session.run(None, {self.input_name: np.asarray(batch, dtype=np.float32)})[0]
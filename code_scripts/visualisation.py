@@ -1,13 +1,19 @@
 import os
+import sys
+import hashlib
 import glob
 import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import numpy as np
 import pandas as pd
-from matplotlib.ticker import FuncFormatter
+try:
+    import pyarrow  # Only used as the parser engine of pd.read_csv.
+    CSV_ENGINE = "pyarrow"
+except ImportError:  # pyarrow is optional; the CSV files are then parsed with the C engine of pandas.
+    CSV_ENGINE = "c"
 import subprocess
 import time
 from datetime import datetime
@@ -34,8 +40,11 @@ CONFIDENCE_THRESHOLD = config.CONFIDENCE_THRESHOLD
 PLOT_WIDTH = config.PLOT_WIDTH
 PLOT_HEIGHT = config.PLOT_HEIGHT
 PLOT_DPI = config.PLOT_DPI
+BAR_BIN_SECONDS = config.BAR_BIN_SECONDS
 NUM_SEGMENTS = config.NUM_SEGMENTS
 POOL_SIZE = config.POOL_SIZE
+PLOT_CACHE_DIR = os.path.join(config.CACHE_DIR, "plots")
+os.makedirs(PLOT_CACHE_DIR, exist_ok=True)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -94,154 +103,360 @@ def time_formatter_in_seconds(x, pos):
     seconds = int(x % 60)
     return f"{minutes}:{seconds:02d}"
 
+# Tick spacings (in seconds) of the time axis; the smallest one giving at most 10 intervals is used.
+TIME_TICK_STEPS = (1, 2, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600)
+
+def set_time_ticks(ax, end):
+    """
+    Set the x-axis limits to 0..end seconds with fixed M:SS tick labels, so that
+    no tick formatter is called back when the figure is drawn.
+    
+    Args:
+        ax (Axes): The axis to label
+        end (float): End of the time axis in seconds
+    """
+    end = end if end > 0 else 0  # Also covers an empty file (NaN)
+    step = next((s for s in TIME_TICK_STEPS if end / s <= 10), 3600 * int(np.ceil(end / 36000)))
+    ticks = step * np.arange(int(end // step) + 1)
+    ax.set_xticks(ticks, [time_formatter_in_seconds(t, None) for t in ticks])
+    ax.set_xlim(0, end)
+
 ###############################################################################
-# PER-SEGMENT FUNCTION for Animation
+# Bars of the emotions above the confidence threshold.
 ###############################################################################
-def produce_segment(seg_index, segment_start_frame, segment_end_frame, total_frames, all_data):
+def get_plot_arrays(df):
     """
-    Creates one animation segment with local progress tracking.
+    Extract the plotted data of a file once as NumPy arrays, so that the bars are
+    selected by array indexing instead of pandas Series indexing.
     
     Args:
-        seg_index (int): Index of the segment
-        segment_start_frame (int): First frame of the segment
-        segment_end_frame (int): Last frame of the segment
+        df (DataFrame): Emotion analysis data as returned by load_analysis_csv
+    
+    Returns:
+        tuple: (times, scores, emotions) - the time of each frame in seconds (a view of
+               the 'time_sec' column), the (frames, emotions) float32 scores and the
+               emotions of emotions_colors that have a column in df, in plotting order
+    """
+    emotions = [emo for emo in emotions_colors if emo in df.columns]
+    times = df['time_sec'].to_numpy(dtype=np.float64, copy=False)
+    scores = df[emotions].to_numpy(dtype=np.float32, copy=False)
+    return times, scores, emotions
+
+
+def draw_emotion_bars(ax, times, scores, emotions):
+    """
+    Draw a bar for every emotion score at or above CONFIDENCE_THRESHOLD.
+    The frames are grouped into bins of BAR_BIN_SECONDS and each bin gets one bar
+    per emotion with the highest score of its frames, so that long videos do not
+    need one bar per frame. The scores of all emotions are compared with the
+    threshold in one NumPy operation; each emotion then only selects its column
+    of the mask.
+    
+    Args:
+        ax (Axes): The axis to draw on
+        times (ndarray): Time of each frame in seconds, in ascending order
+        scores (ndarray): (frames, emotions) float32 array of emotion scores
+        emotions (list): Emotion of each column of scores
+    
+    Returns:
+        list: The BarContainer of each emotion that has bars
+    """
+    width = 0.1
+    if BAR_BIN_SECONDS and len(times):
+        # Index of the bin of each frame; the first frame of each bin starts a reduceat group.
+        bin_index = np.floor(times / BAR_BIN_SECONDS).astype(np.int64)
+        bin_starts = np.flatnonzero(np.diff(bin_index, prepend=bin_index[0] - 1))
+        scores = np.maximum.reduceat(scores, bin_starts, axis=0)
+        times = (bin_index[bin_starts] + 0.5) * BAR_BIN_SECONDS
+        width = BAR_BIN_SECONDS
+    above_threshold = scores >= np.float32(CONFIDENCE_THRESHOLD)
+    bar_containers = []
+    for i, emo in enumerate(emotions):
+        valid_mask = above_threshold[:, i]
+        if valid_mask.any():
+            bars = ax.bar(times[valid_mask], scores[valid_mask, i],
+                          width=width, color=emotions_colors[emo], alpha=0.5,
+                          edgecolor='none', linewidth=0,
+                          label=emotion_rename_map.get(emo, emo))
+            bar_containers.append(bars)
+    return bar_containers
+
+###############################################################################
+# ANIMATION BACKGROUND (rendered once per file)
+###############################################################################
+def render_animation_background(df, title, total_frames):
+    """
+    Renders the plot of the animation (title, axes, bars and legend) once, as the
+    background that every animation frame of the file is made of.
+    
+    Args:
+        df (DataFrame): Emotion analysis data as returned by load_analysis_csv
+        title (str): Title of the plot
         total_frames (int): Total number of frames in the video
-        all_data (list): List containing a tuple of (DataFrame, title_string)
     
     Returns:
-        bool: True if segment was created successfully, False otherwise
+        tuple: (background, line_geometry) where background is the (height, width, 3)
+               RGB image of the plot and line_geometry is (x_scale, x_offset, line_rows,
+               line_width): the pixel column of time t is x_scale * t + x_offset, and the
+               time line covers line_rows of line_width columns around it
     """
-    start_time = time.time()
+    # Create figure and axis (the animation is rendered at 100 dpi)
+    fig, ax = plt.subplots(figsize=(PLOT_WIDTH, PLOT_HEIGHT), dpi=100, constrained_layout=True)
     try:
-        # Generate frame indices for the segment
-        segment_frames = np.arange(segment_start_frame, segment_end_frame)
-        times = segment_frames / FRAME_RATE
-
-        # Create figure and axis
-        fig, ax = plt.subplots(figsize=(PLOT_WIDTH, PLOT_HEIGHT), dpi=PLOT_DPI, constrained_layout=True)
-        df, title_str = all_data[0]
-        ax.set_title(f"{title_str}", fontsize=12, style='italic', pad=6)
+        ax.set_title(f"{title}", fontsize=12, style='italic', pad=6)
         ax.set_ylabel("Confidence (%)")
         ax.set_ylim(CONFIDENCE_THRESHOLD, 100)
-        ax.set_xlim(0, total_frames / FRAME_RATE)
-        ax.xaxis.set_major_formatter(FuncFormatter(time_formatter_in_seconds))
+        set_time_ticks(ax, total_frames / FRAME_RATE)
         ax.set_xlabel("Time (MM:SS)", fontsize=8)
 
         # Draw bars for each emotion
-        bar_containers = []
-        x = df['time_sec'].values
-        for emo, color in emotions_colors.items():
-            if emo in df.columns:
-                y = df[emo].where(df[emo] >= CONFIDENCE_THRESHOLD)
-                valid_mask = y.notna()
-                if valid_mask.any():
-                    bars = ax.bar(x[valid_mask], y[valid_mask],
-                                  width=0.1, color=color, alpha=0.5,
-                                  edgecolor='none', linewidth=0,
-                                  label=emotion_rename_map.get(emo, emo))
-                    bar_containers.append(bars)
+        draw_emotion_bars(ax, *get_plot_arrays(df))
 
         # Add legend
         handles, labels = ax.get_legend_handles_labels()
         if handles:
             ax.legend(loc='upper left', bbox_to_anchor=(1.0, 1), borderaxespad=0, frameon=False, fontsize=8)
 
-        # Animation setup
-        vline = ax.axvline(times[0], color='black', linestyle='--', linewidth=1.5)
-        seg_filename = f"segment_{seg_index}.mp4"
-        seg_path = os.path.join(ANIMATIONS_DIR, seg_filename)
-        if os.path.exists(seg_path):
-            os.remove(seg_path)
+        # Render the static plot. H.264 with yuv420p needs an even width and height.
+        fig.canvas.draw()
+        canvas_width, canvas_height = fig.canvas.get_width_height()
+        background = np.asarray(fig.canvas.buffer_rgba())[:canvas_height // 2 * 2, :canvas_width // 2 * 2, :3].copy()
+        height = background.shape[0]
+
+        # Pixel column of a time on the x-axis (a linear mapping).
+        x_offset = ax.transData.transform((0, 0))[0]
+        x_scale = ax.transData.transform((1, 0))[0] - x_offset
+
+        # The time line is a black dashed line of 1.5 points over the full height of the axis,
+        # with the dash pattern matplotlib uses for linestyle='--'.
+        line_width_points = 1.5
+        points_to_pixels = fig.dpi / 72
+        line_width = max(1, int(round(line_width_points * points_to_pixels)))
+        dash_on, dash_off = (length * line_width_points * points_to_pixels
+                             for length in plt.rcParams['lines.dashed_pattern'])
+        axis_left, axis_bottom, axis_right, axis_top = ax.bbox.extents
+        line_top = max(0, int(round(canvas_height - axis_top)))
+        line_bottom = min(height, int(round(canvas_height - axis_bottom)))
+        rows = np.arange(line_top, line_bottom)
+        # Dashes start at the bottom of the axis, as for axvline.
+        line_rows = rows[(line_bottom - 1 - rows) % (dash_on + dash_off) < dash_on]
+    finally:
+        plt.close(fig)
+    return background, (x_scale, x_offset, line_rows, line_width)
 
-        writer = animation.FFMpegWriter(
-            fps=FRAME_RATE,
-            codec="libx264",
-            bitrate=1500,
-            extra_args=['-preset', 'fast', '-pix_fmt', 'yuv420p', '-crf', '23']
-        )
+###############################################################################
+# Animation background shared with the segment workers.
+###############################################################################
+# Shared memory block with the animation background of the current file (in a segment worker).
+global_shared_background = None
 
-        # Manual frame generation
-        with writer.saving(fig, seg_path, dpi=100):
-            fig.canvas.draw()
-            background = fig.canvas.copy_from_bbox(fig.bbox)
 
-            for frame_idx, frame in enumerate(segment_frames):
-                t = frame / FRAME_RATE  # Convert frame index to timestamp
+def share_background(background):
+    """
+    Copy the animation background of a file into a shared memory block, so that
+    the segment workers can read it without it being pickled for every segment.
+    
+    Args:
+        background (ndarray): The image returned by render_animation_background
+    
+    Returns:
+        SharedMemory: The block, to be closed and unlinked by the caller
+    """
+    shm = shared_memory.SharedMemory(create=True, size=background.nbytes)
+    np.ndarray(background.shape, dtype=np.uint8, buffer=shm.buf)[...] = background
+    return shm
+
 
-                # Print local progress every 10% of the segment
-                if frame_idx % max(1, len(segment_frames) // 10) == 0:
-                    elapsed_time = time.time() - start_time
-                    progress = frame_idx / len(segment_frames) * 100
-                    print(f"\rSegment {seg_index}: {progress:.1f}% complete, Elapsed Time: {elapsed_time:.1f}s", end="")
+def attach_background(shm_name, shape):
+    """
+    Attach a segment worker to the shared animation background of a file. The block
+    stays attached until the background of another file is requested.
+    
+    Args:
+        shm_name (str): Name of the shared memory block created by share_background
+        shape (tuple): Shape of the background image
+    
+    Returns:
+        ndarray: View of the shared background image
+    """
+    global global_shared_background
+    if global_shared_background is None or global_shared_background.name != shm_name:
+        if global_shared_background is not None:
+            try:
+                global_shared_background.close()
+            except BufferError:
+                # A view of the previous file is still referenced; it is freed with the process.
+                pass
+        # Only the main process, which created the block, may track and unlink it.
+        if sys.version_info >= (3, 13):
+            global_shared_background = shared_memory.SharedMemory(name=shm_name, track=False)
+        else:
+            global_shared_background = shared_memory.SharedMemory(name=shm_name)
+            if multiprocessing.get_start_method() == "fork":
+                # Forked workers start their own resource tracker, which would report the
+                # block as leaked when they exit. Spawned workers share the main tracker.
+                resource_tracker.unregister(global_shared_background._name, "shared_memory")
+    return np.ndarray(shape, dtype=np.uint8, buffer=global_shared_background.buf)
 
-                # Update vertical line
-                vline.set_xdata([t, t])
+###############################################################################
+# PER-SEGMENT FUNCTION for Animation
+###############################################################################
+def produce_segment(seg_index, segment_start_frame, segment_end_frame, animation_data):
+    """
+    Creates one animation segment with local progress tracking.
+    Every frame is a copy of the background rendered by render_animation_background
+    with the time line drawn into it, piped to FFmpeg as raw RGB video.
+    
+    Args:
+        seg_index (int): Index of the segment
+        segment_start_frame (int): First frame of the segment
+        segment_end_frame (int): Last frame of the segment
+        animation_data (tuple): (shm_name, shape, line_geometry) of the background
+            shared by share_background, see render_animation_background
+    
+    Returns:
+        tuple: (seg_index, success) where success is True if the segment was created successfully
+    """
+    start_time = time.time()
+    try:
+        # Generate frame indices for the segment
+        segment_frames = np.arange(segment_start_frame, segment_end_frame)
 
-                # Restore background and redraw
-                fig.canvas.restore_region(background)
-                ax.draw_artist(vline)
-                fig.canvas.blit(fig.bbox)
-                writer.grab_frame()
+        shm_name, shape, (x_scale, x_offset, line_rows, line_width) = animation_data
+        background = attach_background(shm_name, shape)
+        height, width = shape[:2]
 
-        plt.close(fig)
+        seg_filename = f"segment_{seg_index}.mp4"
+        seg_path = os.path.join(ANIMATIONS_DIR, seg_filename)
+        if os.path.exists(seg_path):
+            os.remove(seg_path)
+
+        ffmpeg_cmd = [
+            "ffmpeg",
+            "-y",
+            "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "-s", f"{width}x{height}",
+            "-r", str(FRAME_RATE),
+            "-i", "-",
+            "-c:v", "libx264",
+            "-b:v", "1500k",
+            # The segments are joined without re-encoding, so they are the final video:
+            # veryfast at CRF 23 keeps its size close to the earlier fast preset.
+            "-preset", "veryfast",
+            "-pix_fmt", "yuv420p",
+            "-crf", "23",
+            # A keyframe every second (and none on scene cuts), identical for all segments,
+            # so that the segments can be joined without re-encoding them.
+            "-g", str(FRAME_RATE),
+            "-keyint_min", str(FRAME_RATE),
+            "-sc_threshold", "0",
+            seg_path
+        ]
+
+        # Manual frame generation. One frame buffer is reused: only the columns under
+        # the time line are drawn, and restored from the background after each frame.
+        frame_image = background.copy()
+        progress_step = max(1, len(segment_frames) // 10)
+        # Left pixel column of the time line in every frame, from the frame timestamps.
+        line_x = (x_scale * (segment_frames / FRAME_RATE) + x_offset).astype(np.int64)
+        line_lefts = np.clip(line_x - line_width // 2, 0, width).tolist()
+        with subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE) as ffmpeg:
+            try:
+                for frame_idx, line_left in enumerate(line_lefts):
+                    # Print local progress every 10% of the segment
+                    if frame_idx % progress_step == 0:
+                        elapsed_time = time.time() - start_time
+                        progress = frame_idx / len(segment_frames) * 100
+                        print(f"\rSegment {seg_index}: {progress:.1f}% complete, Elapsed Time: {elapsed_time:.1f}s", end="")
+
+                    # Draw the vertical line
+                    line_columns = slice(line_left, line_left + line_width)
+                    frame_image[line_rows, line_columns] = 0
+                    ffmpeg.stdin.write(frame_image.data)
+                    frame_image[:, line_columns] = background[:, line_columns]
+            except Exception:
+                ffmpeg.kill()
+                raise
+        if ffmpeg.returncode != 0:
+            raise subprocess.CalledProcessError(ffmpeg.returncode, ffmpeg_cmd)
+
+        del background
         elapsed = time.time() - start_time
         print(f"\n✅ Segment {seg_index} saved ({elapsed:.1f}s)")
-        return True
+        return seg_index, True
     except Exception as e:
         elapsed = time.time() - start_time
         print(f"\n❌ Segment {seg_index} failed after {elapsed:.1f}s: {str(e)}")
-        if 'fig' in locals():
-            plt.close(fig)
-        return False
+        return seg_index, False
+
+def produce_segment_task(args):
+    """Unpack the arguments of one segment for Pool.imap_unordered and create it."""
+    return produce_segment(*args)
 
 ###############################################################################
-# STATIC PLOT FUNCTION
+# CSV LOADING FUNCTION
 ###############################################################################
-def create_static_plot_for_file(csv_file):
+def load_analysis_csv(csv_file):
     """
-    Reads an individual analysis CSV file and creates a static bar plot.
+    Reads the columns of an individual analysis CSV file that are plotted,
+    sorted by frame number and with the time of each frame in seconds.
     
     Args:
         csv_file (str): Path to the CSV file containing emotion analysis data
     
     Returns:
-        None
-        
-    The function creates a plot with time (MM:SS) on the x-axis and emotion
-    confidence percentages on the y-axis. Only confidence values above the
-    threshold defined in config.CONFIDENCE_THRESHOLD are shown.
-    Saves the plot as a PNG in the PLOTS_DIR.
+        DataFrame or None: The data with a 'time_sec' column, or None if the file
+        could not be read or has no 'frame_number' column
     """
     try:
-        df = pd.read_csv(csv_file)
+        # The pyarrow engine only accepts a list of columns, so the header is read first.
+        header = pd.read_csv(csv_file, nrows=0).columns
+        usecols = [column for column in header if column == 'frame_number' or column in emotions_colors]
+        # The scores are percentages, for which float32 is precise enough at half the memory.
+        dtype = {column: np.float32 for column in usecols if column in emotions_colors}
+        df = pd.read_csv(csv_file, usecols=usecols, dtype=dtype, engine=CSV_ENGINE)
     except Exception as e:
         print(f"Error reading {csv_file}: {e}")
-        return
+        return None
     if 'frame_number' not in df.columns:
         print(f"'frame_number' column missing in {csv_file}, skipping.")
-        return
+        return None
     df.sort_values("frame_number", inplace=True)
     df['time_sec'] = df['frame_number'] / FRAME_RATE
-    base_name = os.path.splitext(os.path.basename(csv_file))[0]
-    title = base_name.replace("_emotional_analysis", "")
+    return df
+
+###############################################################################
+# STATIC PLOT FUNCTION
+###############################################################################
+def create_static_plot_for_file(df, title, base_name):
+    """
+    Creates a static bar plot of the data of an individual analysis CSV file.
+    
+    Args:
+        df (DataFrame): Emotion analysis data as returned by load_analysis_csv
+        title (str): Title of the plot
+        base_name (str): Name of the CSV file without extension, used for the PNG file name
+    
+    Returns:
+        None
+        
+    The function creates a plot with time (MM:SS) on the x-axis and emotion
+    confidence percentages on the y-axis. Only confidence values above the
+    threshold defined in config.CONFIDENCE_THRESHOLD are shown.
+    Saves the plot as a PNG in the PLOTS_DIR.
+    """
     fig, ax = plt.subplots(figsize=(PLOT_WIDTH, PLOT_HEIGHT), dpi=PLOT_DPI, constrained_layout=True)
     ax.set_title(f"{title}", fontsize=12, style='italic', pad=6)
     ax.set_ylabel("Confidence (%)")
     ax.set_ylim(CONFIDENCE_THRESHOLD, 100)
-    ax.set_xlim(0, df['time_sec'].max())
-    ax.xaxis.set_major_formatter(FuncFormatter(time_formatter_in_seconds))
+    times, scores, emotions = get_plot_arrays(df)
+    set_time_ticks(ax, np.max(times, initial=0))
     ax.set_xlabel("Time (MM:SS)", fontsize=8)
     ax.xaxis.labelpad = 0
     ax.xaxis.set_label_coords(0.5, -0.05)
-    for emo, color in emotions_colors.items():
-        if emo in df.columns:
-            y = df[emo].where(df[emo] >= CONFIDENCE_THRESHOLD)
-            valid_mask = y.notna()
-            if valid_mask.any():
-                ax.bar(df['time_sec'][valid_mask], y[valid_mask],
-                       width=0.1, color=color, alpha=0.5,
-                       edgecolor='none', linewidth=0,
-                       label=emotion_rename_map.get(emo, emo))
+    draw_emotion_bars(ax, times, scores, emotions)
     handles, labels = ax.get_legend_handles_labels()
     if handles:
         ax.legend(loc='upper left', bbox_to_anchor=(1.0, 1), borderaxespad=0, frameon=False, fontsize=8)
@@ -251,23 +466,90 @@ def create_static_plot_for_file(csv_file):
     plt.savefig(static_plot_path)
     plt.close(fig)
     print(f"Static plot saved to: {static_plot_path}")
+    return static_plot_path
+
+
+def static_plot_key(csv_file):
+    """
+    Key of the static plot of a CSV file: the file, its modification time, the plot
+    settings and the source of this module, so that editing the drawing code also
+    invalidates the plots drawn before.
+    
+    Args:
+        csv_file (str): Path to the CSV file containing emotion analysis data
+    
+    Returns:
+        str: Hex digest identifying the plot
+    """
+    with open(__file__, "rb") as f:
+        source = f.read()
+    plot_settings = (CONFIDENCE_THRESHOLD, PLOT_WIDTH, PLOT_HEIGHT, PLOT_DPI, BAR_BIN_SECONDS, FRAME_RATE)
+    key = repr((os.path.abspath(csv_file), os.path.getmtime(csv_file), plot_settings)).encode()
+    return hashlib.sha256(key + source).hexdigest()
+
+
+def make_static_plot(csv_file, df, title, base_name, force=False):
+    """
+    Create the static plot of a CSV file, unless the PNG was saved from the unchanged
+    file with the current settings and has not been replaced since.
+    
+    The key of every saved plot is kept in PLOT_CACHE_DIR together with the
+    modification time of the PNG, so a PNG that was redrawn with other settings
+    (or rewritten in any other way) no longer matches a key from before.
+    
+    Args:
+        csv_file (str): Path to the CSV file containing emotion analysis data
+        df (DataFrame): Emotion analysis data as returned by load_analysis_csv
+        title (str): Title of the plot
+        base_name (str): Name of the CSV file without extension
+        force (bool): Recreate the plot even if it is up to date
+    """
+    static_plot_path = os.path.join(PLOTS_DIR, f"{base_name}_static.png")
+    key_path = os.path.join(PLOT_CACHE_DIR, f"{base_name}_static.key")
+    key = static_plot_key(csv_file)
+    if not force and os.path.exists(static_plot_path) and os.path.exists(key_path):
+        with open(key_path, encoding="utf-8") as f:
+            if f.read() == f"{key} {os.stat(static_plot_path).st_mtime_ns}":
+                print(f"Static plot is up to date: {static_plot_path}")
+                return
+    create_static_plot_for_file(df, title, base_name)
+    with open(key_path, "w", encoding="utf-8") as f:
+        f.write(f"{key} {os.stat(static_plot_path).st_mtime_ns}")
 
 ###############################################################################
 # MAIN VISUALISATION FUNCTION
 ###############################################################################
-def run_visualisation(sheet=""):
+def outputs_up_to_date(csv_file, base_name):
+    """
+    Check whether the static plot and the animation of a CSV file are newer than the file.
+    
+    Args:
+        csv_file (str): Path to the CSV file containing emotion analysis data
+        base_name (str): Name of the CSV file without extension
+    
+    Returns:
+        bool: True if both outputs exist and were written after the CSV file was last modified
+    """
+    source_mtime = os.path.getmtime(csv_file)
+    outputs = [os.path.join(PLOTS_DIR, f"{base_name}_static.png"),
+               os.path.join(ANIMATIONS_DIR, f"{base_name}_animation.mp4")]
+    return all(os.path.exists(path) and os.path.getmtime(path) >= source_mtime for path in outputs)
+
+
+def run_visualisation(sheet="", force=False):
     """
     Main function to create static plots and animations from emotion analysis data.
     
     Args:
         sheet (str): Optional specific CSV file to process. If empty, processes all CSV files.
+        force (bool): Recreate the plots and animations even of files whose outputs are up to date.
     
     Returns:
         None
         
     This function:
     0. Ensures FFmpeg is ready (called once)
-    1. Finds all CSV files with emotion analysis data
+    1. Finds all CSV files with emotion analysis data (skipping those with up-to-date outputs)
     2. Creates static plots for each file
     3. Creates segmented animations for each file using multiprocessing
     4. Concatenates segments into a final animation using FFmpeg
@@ -289,109 +571,127 @@ def run_visualisation(sheet=""):
         print("No analysis CSV files found in the analysis folder.")
         return
 
-    for csv_file in csv_files:
-        print(f"Processing file: {csv_file}")
-
-        # Create static plot
-        create_static_plot_for_file(csv_file)
-
-        # Create animation for each file
-        try:
-            df = pd.read_csv(csv_file)
-        except Exception as e:
-            print(f"Error reading {csv_file}: {e}")
-            continue
-        if 'frame_number' not in df.columns:
-            print(f"'frame_number' missing in {csv_file}, skipping animation.")
-            continue
-        df.sort_values("frame_number", inplace=True)
-        df['time_sec'] = df['frame_number'] / FRAME_RATE
-        base_name = os.path.splitext(os.path.basename(csv_file))[0]
-        title = base_name.replace("_emotional_analysis", "")
-        all_data = [(df, title)]
-        total_frames = len(df)
-        print(f"For file {csv_file}, total frames: {total_frames}")
-
-        # Set up segmentation for animation
-        segment_length_frames = total_frames // NUM_SEGMENTS
-        segments = []
-        current_start_frame = 0
-
-        for i in range(NUM_SEGMENTS):
-            seg_index = i + 1
-            seg_end_frame = current_start_frame + segment_length_frames
-            if seg_index == NUM_SEGMENTS:  # Last segment
-                seg_end_frame = total_frames
-            segments.append((seg_index, current_start_frame, seg_end_frame, total_frames, all_data))
-            current_start_frame = seg_end_frame
-
-        print("\nSegments:")
-        for seg_tuple in segments:
-            seg_idx, s_start, s_end, _, _ = seg_tuple
-            print(f"Segment {seg_idx}: Frames {s_start}..{s_end}")
-
-        print(f"Creating animation for {csv_file} in {NUM_SEGMENTS} segments.")
-        start_processing = time.time()
-
-        pool = multiprocessing.Pool(processes=POOL_SIZE)
-        results = pool.starmap(produce_segment, [(seg_index, s_start, s_end, total_frames, all_data)
-                                                 for seg_index, s_start, s_end, _, _ in segments])
-        pool.close()
-        pool.join()
-
-        success_count = sum(results)
-        failed_segments = [i + 1 for i, success in enumerate(results) if not success]
-        total_time = time.time() - start_processing
-        print(f"\nAnimation for {csv_file} processed in {total_time:.1f} seconds, success {success_count}/{NUM_SEGMENTS}")
-
-        # Proceed with concatenation only if all segments were successful
-        if success_count != NUM_SEGMENTS:
-            print(f"Skipping concatenation for {csv_file} due to failed segments: {failed_segments}")
-            continue
-
-        # FFmpeg concatenation
-        concat_file_path = os.path.join(ANIMATIONS_DIR, f"{base_name}_concat_list.txt")
-        with open(concat_file_path, "w", encoding="utf-8") as f:
-            for i in range(1, NUM_SEGMENTS + 1):
-                seg_path = os.path.join(ANIMATIONS_DIR, f"segment_{i}.mp4")
-                if os.path.exists(seg_path):
-                    f.write(f"file '{os.path.abspath(seg_path)}'\n")
-                else:
-                    print(f"Warning: Segment file {seg_path} not found for concatenation list.")
-
-        final_merged_path = os.path.join(ANIMATIONS_DIR, f"{base_name}_animation.mp4")
-        ffmpeg_cmd = [
-            "ffmpeg",
-            "-y",
-            "-f", "concat",
-            "-safe", "0",
-            "-i", concat_file_path,
-            "-c:v", "libx264",
-            "-crf", "20",
-            "-pix_fmt", "yuv420p",
-            final_merged_path
-        ]
-
-        try:
-            print("Starting FFmpeg concatenation...")
-            subprocess.run(ffmpeg_cmd, check=True)
-            print(f"Final animation saved to: {final_merged_path}")
-
-            # Cleanup on Success
-            print("Cleaning up temporary files...")
-            for i in range(1, NUM_SEGMENTS + 1):
-                seg_path = os.path.join(ANIMATIONS_DIR, f"segment_{i}.mp4")
-                if os.path.exists(seg_path):
-                    os.remove(seg_path)
-            if os.path.exists(concat_file_path):
-                os.remove(concat_file_path)
-            print("Cleanup complete.")
-        except subprocess.CalledProcessError as e:
-            print(f"FFmpeg error: {e}")
-        except FileNotFoundError:
-            print("FFmpeg could not find any files to combine.")
-
-        print("Animation creation complete for this file.\n")
+    # One pool renders the segments of all files. It is only started once a file needs
+    # an animation, so a run in which everything is up to date starts no workers.
+    pool = None
+    try:
+        for csv_file in csv_files:
+            base_name = os.path.splitext(os.path.basename(csv_file))[0]
+            if not force and os.path.exists(csv_file) and outputs_up_to_date(csv_file, base_name):
+                print(f"Skipping {csv_file}: plot and animation are up to date (use --force to recreate them).")
+                continue
+            print(f"Processing file: {csv_file}")
+
+            # Read the file once for the static plot and the animation
+            df = load_analysis_csv(csv_file)
+            if df is None:
+                continue
+            title = base_name.replace("_emotional_analysis", "")
+
+            # Create static plot
+            make_static_plot(csv_file, df, title, base_name, force)
+
+            # Create animation for each file
+            total_frames = len(df)
+            print(f"For file {csv_file}, total frames: {total_frames}")
+
+            # Set up segmentation for animation
+            segment_length_frames = total_frames // NUM_SEGMENTS
+            segments = []
+            current_start_frame = 0
+
+            for i in range(NUM_SEGMENTS):
+                seg_index = i + 1
+                seg_end_frame = current_start_frame + segment_length_frames
+                if seg_index == NUM_SEGMENTS:  # Last segment
+                    seg_end_frame = total_frames
+                segments.append((seg_index, current_start_frame, seg_end_frame))
+                current_start_frame = seg_end_frame
+
+            print("\nSegments:")
+            for seg_idx, s_start, s_end in segments:
+                print(f"Segment {seg_idx}: Frames {s_start}..{s_end}")
+
+            print(f"Creating animation for {csv_file} in {NUM_SEGMENTS} segments.")
+            start_processing = time.time()
+
+            # The plot is rendered once here; the workers read it from shared memory and
+            # only draw the time line into each frame.
+            try:
+                background, line_geometry = render_animation_background(df, title, total_frames)
+            except Exception as e:
+                print(f"Error rendering the animation background for {csv_file}: {e}")
+                continue
+            if pool is None:
+                # More workers than segments or cores would only sit idle.
+                pool = multiprocessing.Pool(processes=max(1, min(POOL_SIZE, NUM_SEGMENTS, os.cpu_count() or 1)))
+            shared_background = share_background(background)
+            animation_data = (shared_background.name, background.shape, line_geometry)
+            try:
+                results = dict(pool.imap_unordered(
+                    produce_segment_task,
+                    [(seg_index, s_start, s_end, animation_data) for seg_index, s_start, s_end in segments]
+                ))
+            finally:
+                shared_background.close()
+                shared_background.unlink()
+
+            success_count = sum(results.values())
+            failed_segments = sorted(seg_index for seg_index, success in results.items() if not success)
+            total_time = time.time() - start_processing
+            print(f"\nAnimation for {csv_file} processed in {total_time:.1f} seconds, success {success_count}/{NUM_SEGMENTS}")
+
+            # Proceed with concatenation only if all segments were successful
+            if success_count != NUM_SEGMENTS:
+                print(f"Skipping concatenation for {csv_file} due to failed segments: {failed_segments}")
+                continue
+
+            # FFmpeg concatenation
+            concat_file_path = os.path.join(ANIMATIONS_DIR, f"{base_name}_concat_list.txt")
+            with open(concat_file_path, "w", encoding="utf-8") as f:
+                for i in range(1, NUM_SEGMENTS + 1):
+                    seg_path = os.path.join(ANIMATIONS_DIR, f"segment_{i}.mp4")
+                    if os.path.exists(seg_path):
+                        f.write(f"file '{os.path.abspath(seg_path)}'\n")
+                    else:
+                        print(f"Warning: Segment file {seg_path} not found for concatenation list.")
+
+            final_merged_path = os.path.join(ANIMATIONS_DIR, f"{base_name}_animation.mp4")
+            ffmpeg_cmd = [
+                "ffmpeg",
+                "-y",
+                "-f", "concat",
+                "-safe", "0",
+                "-i", concat_file_path,
+                "-c", "copy",  # The segments share their encoder settings, so they are only remuxed.
+                final_merged_path
+            ]
+
+            try:
+                print("Starting FFmpeg concatenation...")
+                subprocess.run(ffmpeg_cmd, check=True)
+                print(f"Final animation saved to: {final_merged_path}")
+
+                # Cleanup on Success
+                print("Cleaning up temporary files...")
+                for i in range(1, NUM_SEGMENTS + 1):
+                    seg_path = os.path.join(ANIMATIONS_DIR, f"segment_{i}.mp4")
+                    if os.path.exists(seg_path):
+                        os.remove(seg_path)
+                if os.path.exists(concat_file_path):
+                    os.remove(concat_file_path)
+                print("Cleanup complete.")
+            except subprocess.CalledProcessError as e:
+                print(f"FFmpeg error: {e}")
+            except FileNotFoundError:
+                print("FFmpeg could not find any files to combine.")
+
+            print("Animation creation complete for this file.\n")
+    finally:
+        if pool is not None:
+            # All segments have been collected unless an error ended the loop early.
+            pool.terminate()
+            pool.join()
 
     overall_end = time.time()
     overall_duration = overall_end - overall_start
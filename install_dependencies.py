@@ -1,51 +1,118 @@
-import os
-import sys
-import importlib.util
-import subprocess
-import warnings
-import multiprocessing as mp 
-
-# Suppress Python deprecation warnings.
-warnings.filterwarnings("ignore", category=DeprecationWarning)
-
-# Set TensorFlow environment variables.
-os.environ['TF_ENABLE_ONEDNN_OPTS'] = '2'
-os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # '3' hides INFO, WARNING & ERROR
-
-# Define REQUIREMENTS_PATH relative to this script's location
-_INSTALL_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-# Assumes 'code_scripts' is a subdirectory of the directory containing install_dependencies.py
-REQUIREMENTS_PATH = os.path.join(_INSTALL_SCRIPT_DIR, "code_scripts", "requirements.txt")
-
-def install_dependencies(requirements_path):
-    """
-    Install the required dependencies listed in the requirements file.
-
-    Args:
-        requirements_path (str): Path to the requirements file.
-
-    Raises:
-        FileNotFoundError: If the requirements file is not found.
-        subprocess.CalledProcessError: If pip installation fails.
-    """
-    try:
-        with open(requirements_path) as file:
-            packages = [line.strip() for line in file if line.strip() and not line.startswith("#")]
-        for package in packages:
-            pkg_name = package.split("==")[0].strip()
-            # Map package names to module names if they differ.
-            module_name = {"tf-keras": "tf_keras", "opencv-python": "cv2"}.get(pkg_name, pkg_name)
-            if importlib.util.find_spec(module_name) is None:
-                print(f"Installing missing package: {package}")
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-            else:
-                print(f"Package '{package}' is already installed.")
-    except FileNotFoundError:
-        print(f"Error: '{requirements_path}' not found.")
-        sys.exit(1)
-
-if mp.current_process().name == "MainProcess":
-    install_dependencies(REQUIREMENTS_PATH)
-
-if __name__ == '__main__':
+import os
+import sys
+import re
+import json
+import compileall
+import importlib.metadata
+import subprocess
+import warnings
+
+# Suppress Python deprecation warnings.
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+# Set TensorFlow environment variables.
+os.environ['TF_ENABLE_ONEDNN_OPTS'] = '2'
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # '3' hides INFO, WARNING & ERROR
+
+# Define REQUIREMENTS_PATH relative to this script's location
+_INSTALL_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Assumes 'code_scripts' is a subdirectory of the directory containing install_dependencies.py
+REQUIREMENTS_PATH = os.path.join(_INSTALL_SCRIPT_DIR, "code_scripts", "requirements.txt")
+# Written after a complete check, so that an unchanged requirements file is not checked again.
+REQUIREMENTS_STAMP_PATH = os.path.join(_INSTALL_SCRIPT_DIR, ".requirements_ok.json")
+
+def normalize_package_name(name):
+    """
+    Normalize a distribution name as pip does, e.g. 'tf_keras' -> 'tf-keras'.
+
+    Args:
+        name (str): Package name from the requirements file or the installed metadata.
+
+    Returns:
+        str: The lower-case name with runs of '-', '_' and '.' replaced by '-'.
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def requirements_stamp(requirements_path):
+    """
+    Identify the requirements file and the Python environment it was checked for.
+
+    Args:
+        requirements_path (str): Path to the requirements file.
+
+    Returns:
+        dict: The interpreter path and the modification time and size of the file.
+
+    Raises:
+        FileNotFoundError: If the requirements file is not found.
+    """
+    stat = os.stat(requirements_path)
+    return {"python": sys.executable, "mtime": stat.st_mtime, "size": stat.st_size}
+
+
+def read_requirements_stamp():
+    """
+    Returns:
+        dict or None: The stamp of the last complete check, or None if there is none.
+    """
+    try:
+        with open(REQUIREMENTS_STAMP_PATH) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def install_dependencies(requirements_path):
+    """
+    Install the required dependencies listed in the requirements file.
+    Nothing is checked if the file is unchanged since the last complete check
+    in this Python environment (see REQUIREMENTS_STAMP_PATH).
+
+    Args:
+        requirements_path (str): Path to the requirements file.
+
+    Raises:
+        FileNotFoundError: If the requirements file is not found.
+        subprocess.CalledProcessError: If pip installation fails.
+    """
+    try:
+        stamp = requirements_stamp(requirements_path)
+        if read_requirements_stamp() == stamp:
+            print("Dependencies already checked; requirements.txt is unchanged.")
+            return
+        with open(requirements_path) as file:
+            packages = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+        # Names of all installed distributions, read once from their metadata.
+        installed = {normalize_package_name(dist.metadata["Name"])
+                     for dist in importlib.metadata.distributions() if dist.metadata["Name"]}
+        missing = []
+        for package in packages:
+            pkg_name = package.split("==")[0].strip()
+            # Standard library modules are only listed for reference.
+            if pkg_name.split(".")[0] in sys.stdlib_module_names:
+                continue
+            if normalize_package_name(pkg_name) not in installed:
+                missing.append(package)
+            else:
+                print(f"Package '{package}' is already installed.")
+        # Install all missing packages with one pip run, so pip resolves them together.
+        if missing:
+            print(f"Installing missing packages: {', '.join(missing)}")
+            subprocess.check_call([sys.executable, "-m", "pip", "install",
+                                   "--disable-pip-version-check", "--no-input", *missing])
+        with open(REQUIREMENTS_STAMP_PATH, "w") as file:
+            json.dump(stamp, file)
+    except FileNotFoundError:
+        print(f"Error: '{requirements_path}' not found.")
+        sys.exit(1)
+
+# Run as a script: python install_dependencies.py (importing this module installs nothing).
+if __name__ == '__main__':
+    # Set SKIP_DEP_CHECK=1 to skip the check entirely.
+    if not os.environ.get("SKIP_DEP_CHECK"):
+        install_dependencies(REQUIREMENTS_PATH)
+        # Byte-compile the project modules now, so that the first run of main.py (and every
+        # worker process) can load them from __pycache__ instead of compiling them.
+        compileall.compile_dir(os.path.join(_INSTALL_SCRIPT_DIR, "code_scripts"), quiet=1, workers=0)
     print("Dependency installation completed.")
\ No newline at end of file
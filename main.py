@@ -1,71 +1,141 @@
-import os
-import sys
-import argparse
-import warnings
-
-# Get the directory containing this script (main.py).
-# This is assumed to be the project root or a directory from which 'code_scripts' is a direct subdirectory.
-_MAIN_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-
-# Add this directory to sys.path to ensure 'code_scripts' module can be found.
-# This makes the script more robust if run from a different working directory.
-if _MAIN_SCRIPT_DIR not in sys.path:
-    sys.path.insert(0, _MAIN_SCRIPT_DIR)
-
-from code_scripts.analysis import run_analysis
-from code_scripts.visualisation import run_visualisation
-from code_scripts import config
-
-# Suppress Python deprecation warnings.
-warnings.filterwarnings("ignore", category=DeprecationWarning)
-
-# Set TensorFlow environment variables.
-os.environ['TF_ENABLE_ONEDNN_OPTS'] = '2'
-os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # '3' hides INFO, WARNING & ERROR
-
-def main():
-    """
-    Main function to run the Video Emotion Analysis and Visualisation Tool.
-    
-    Parses command-line arguments to determine whether to run analysis, 
-    visualisation, or both. Also handles optional parameters like frame_step
-    for analysis and specific sheet selection for visualisation.
-    
-    Returns:
-        None
-    """
-    parser = argparse.ArgumentParser(
-        description="Video Emotion Analysis and Visualisation Tool"
-    )
-    
-    # Command to choose analysis or visualisation.
-    parser.add_argument("command", nargs="?", choices=["analysis", "visualisation"], default=None,
-                        help="Specify whether to run 'analysis', 'visualisation', or leave empty to run both.")
-    
-    # Frame step argument for analysis.
-    parser.add_argument("--frame_step", type=int, default=config.FRAME_STEP,
-                        help="Analyze every n-th frame (default is as set in config.py).")
-    
-    # Optional argument for visualisation: specify a particular CSV file (sheet).
-    parser.add_argument("--sheet", type=str, default="",
-                        help="Optional: specify the analysis CSV file to process (e.g. 'Entrepreneur_emotional_analysis.csv').")
-    
-    args = parser.parse_args()
-
-    if args.command is None:
-        print("No command specified. Running both analysis and visualisation...")
-        print(f"Starting analysis with a frame step of every {args.frame_step} frame(s)...")
-        run_analysis(frame_step=args.frame_step)
-        print("Starting visualisation after analysis...")
-        run_visualisation(sheet=args.sheet)
-    
-    elif args.command == "analysis":
-        print(f"Starting analysis with a frame step of every {args.frame_step} frame(s)...")
-        run_analysis(frame_step=args.frame_step)
-    
-    elif args.command == "visualisation":
-        print("Starting visualisation...")
-        run_visualisation(sheet=args.sheet)
-
-if __name__ == '__main__':
+import os
+import sys
+import types
+import warnings
+
+# Get the directory containing this script (main.py).
+# This is assumed to be the project root or a directory from which 'code_scripts' is a direct subdirectory.
+_MAIN_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Add this directory to sys.path to ensure 'code_scripts' module can be found.
+# This makes the script more robust if run from a different working directory.
+if _MAIN_SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, _MAIN_SCRIPT_DIR)
+
+# The analysis (TensorFlow, DeepFace) and visualisation (matplotlib) modules are only
+# imported by the command that needs them, see main().
+from code_scripts import config
+
+# Suppress Python deprecation warnings.
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+# Set TensorFlow environment variables.
+os.environ['TF_ENABLE_ONEDNN_OPTS'] = '2'
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # '3' hides INFO, WARNING & ERROR
+
+COMMANDS = ("analysis", "visualisation")
+
+
+def build_parser():
+    """
+    Build the argparse parser of the command line. It is only used for help
+    and error messages; parse_args handles the usual invocations itself.
+
+    Returns:
+        ArgumentParser: The parser of the command line.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Video Emotion Analysis and Visualisation Tool"
+    )
+    
+    # Command to choose analysis or visualisation.
+    parser.add_argument("command", nargs="?", choices=COMMANDS, default=None,
+                        help="Specify whether to run 'analysis', 'visualisation', or leave empty to run both.")
+    
+    # Frame step argument for analysis.
+    parser.add_argument("--frame_step", type=int, default=config.FRAME_STEP,
+                        help="Analyze every n-th frame (default is as set in config.py).")
+    
+    # Optional argument for visualisation: specify a particular CSV file (sheet).
+    parser.add_argument("--sheet", type=str, default="",
+                        help="Optional: specify the analysis CSV file to process (e.g. 'Entrepreneur_emotional_analysis.csv').")
+    
+    # Optional argument for visualisation: recreate outputs that are up to date.
+    parser.add_argument("--force", action="store_true",
+                        help="Optional: recreate plots and animations even if they are newer than their CSV file.")
+    return parser
+
+
+def parse_args(argv):
+    """
+    Parse the command line without importing argparse for the usual invocations:
+    an optional command, --frame_step N, --sheet NAME (also as --option=value) and --force.
+    Anything else, such as -h or an invalid argument, is passed to the argparse
+    parser, which prints the help or error message.
+
+    Args:
+        argv (list): The command-line arguments without the program name.
+
+    Returns:
+        Namespace: The command, frame_step, sheet and force.
+    """
+    command = None
+    frame_step = config.FRAME_STEP
+    sheet = ""
+    force = False
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in COMMANDS and command is None:
+            command = arg
+            i += 1
+            continue
+        if arg == "--force":
+            force = True
+            i += 1
+            continue
+        name, has_value, value = arg.partition("=")
+        if name not in ("--frame_step", "--sheet"):
+            return build_parser().parse_args(argv)
+        if not has_value:
+            if i + 1 == len(argv):
+                return build_parser().parse_args(argv)
+            i += 1
+            value = argv[i]
+        if name == "--frame_step":
+            try:
+                frame_step = int(value)
+            except ValueError:
+                return build_parser().parse_args(argv)
+        else:
+            sheet = value
+        i += 1
+    return types.SimpleNamespace(command=command, frame_step=frame_step, sheet=sheet, force=force)
+
+
+def main():
+    """
+    Main function to run the Video Emotion Analysis and Visualisation Tool.
+    
+    Parses command-line arguments to determine whether to run analysis, 
+    visualisation, or both. Also handles optional parameters like frame_step
+    for analysis and specific sheet selection for visualisation.
+    
+    Returns:
+        None
+    """
+    args = parse_args(sys.argv[1:])
+
+    if args.command is None:
+        from code_scripts.analysis import run_analysis
+        from code_scripts.visualisation import run_visualisation
+        print("No command specified. Running both analysis and visualisation...")
+        print(f"Starting analysis with a frame step of every {args.frame_step} frame(s)...")
+        run_analysis(frame_step=args.frame_step)
+        print("Starting visualisation after analysis...")
+        run_visualisation(sheet=args.sheet, force=args.force)
+    
+    elif args.command == "analysis":
+        from code_scripts.analysis import run_analysis
+        print(f"Starting analysis with a frame step of every {args.frame_step} frame(s)...")
+        run_analysis(frame_step=args.frame_step)
+    
+    elif args.command == "visualisation":
+        from code_scripts.visualisation import run_visualisation
+        print("Starting visualisation...")
+        run_visualisation(sheet=args.sheet, force=args.force)
+
+if __name__ == '__main__':
     main()
\ No newline at end of file